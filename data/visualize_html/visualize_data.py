@@ -13,6 +13,10 @@ This script:
  - opens an interactive matplotlib window (rotate/zoom with mouse)
 
 Optional: set --plotly to write an interactive HTML file (good if you cannot open GUI).
+
+For large fleets, --lod simplifies each polyline (Douglas-Peucker, --lod-tolerance metres),
+merges all drones into a few NaN-separated batched traces and caps the total number of
+rendered points (--max-points), so the view stays responsive and the HTML stays small.
 """
 
 import json
@@ -39,6 +43,127 @@ def load_scenario(path):
         raise FileNotFoundError(f"scenario file not found: {path}")
     return json.loads(p.read_text())
 
+def simplify_polyline(pts, tolerance):
+    # iterative Douglas-Peucker in 3D; always keeps both endpoints
+    n = len(pts)
+    if n <= 2 or tolerance <= 0:
+        return pts
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i0, i1 = stack.pop()
+        if i1 - i0 < 2:
+            continue
+        a, b = pts[i0], pts[i1]
+        ab = b - a
+        L2 = float(np.dot(ab, ab))
+        mid = pts[i0 + 1:i1]
+        if L2 < 1e-12:
+            d = np.linalg.norm(mid - a, axis=1)
+        else:
+            u = np.clip((mid - a) @ ab / L2, 0.0, 1.0)
+            d = np.linalg.norm(mid - (a + u[:, None] * ab), axis=1)
+        k = int(np.argmax(d))
+        if d[k] > tolerance:
+            k += i0 + 1
+            keep[k] = True
+            stack.append((i0, k))
+            stack.append((k, i1))
+    return pts[keep]
+
+
+def lod_polylines(scen, tolerance=0.5, max_points=20000):
+    """Simplify every drone path so that paths plus start/end markers fit in max_points.
+
+    Returns (polys, label) where label describes the LOD applied, for plot titles.
+    """
+    raw = []
+    for i, d in enumerate(scen["drones"]):
+        w = np.array(d["waypoints"], dtype=float)
+        if w.size == 0:
+            continue
+        raw.append((d.get("id", f"drone_{i}"), w))
+    notes = []
+
+    # every drone costs at least 4 points (2 path endpoints + start/end markers);
+    # past that floor the only way to honour the cap is to drop whole drones
+    n_keep = max_points // 4
+    if len(raw) > n_keep:
+        n_all = len(raw)
+        idx = np.unique(np.linspace(0, n_all - 1, n_keep).round().astype(int)) if n_keep else []
+        raw = [raw[i] for i in idx]
+        notes.append(f"{len(raw)} of {n_all} drones")
+        print(f"LOD: {n_all} drones exceed --max-points={max_points}; showing {len(raw)} evenly spaced drones")
+    budget = max_points - 2 * len(raw)
+
+    # always simplify the original polylines so the reported tolerance is the true bound
+    tol = tolerance
+    for attempt in range(16):
+        if attempt:
+            tol = tol * 2 if tol > 0 else 0.1
+        polys = [(id_, simplify_polyline(w, tol)) for id_, w in raw]
+        total = sum(len(w) for _, w in polys)
+        if total <= budget:
+            return polys, ", ".join([f"tol={tol:g} m"] + notes)
+
+    # still over budget: stride-decimate, keeping endpoints (no longer bounded by tol)
+    # terminates: at worst every polyline is down to its 2 endpoints, which fits the budget
+    stride = 2
+    while True:
+        decimated = [(id_, np.vstack([w[:-1:stride], w[-1:]])) for id_, w in polys]
+        if sum(len(w) for _, w in decimated) <= budget or all(len(w) <= 2 for _, w in decimated):
+            break
+        stride *= 2
+    notes.append(f"stride {stride}")
+    print(f"LOD: tolerance {tol:g} m was not enough; decimating with stride {stride}")
+    return decimated, ", ".join([f"tol={tol:g} m"] + notes)
+
+
+def batch_polylines(polys, n_batches=10):
+    """Merge polylines round-robin into n_batches arrays separated by NaN rows."""
+    gap = np.full((1, 3), np.nan)
+    batches = []
+    for b in range(min(n_batches, len(polys))):
+        members = polys[b::n_batches]
+        parts = []
+        for _, w in members:
+            parts.append(w)
+            parts.append(gap)
+        batches.append((len(members), np.vstack(parts[:-1])))
+    return batches
+
+
+def plot_matplotlib_lod(scen, tolerance=0.5, max_points=20000, n_batches=10, title=None):
+    polys, lod_label = lod_polylines(scen, tolerance, max_points)
+    fig = plt.figure(figsize=(10, 7))
+    ax = fig.add_subplot(111, projection="3d")
+    cmap = plt.get_cmap("tab10")
+
+    for b, (count, pts) in enumerate(batch_polylines(polys, n_batches)):
+        ax.plot(pts[:, 0], pts[:, 1], pts[:, 2], '.-', color=cmap(b % 10), markersize=2,
+                linewidth=1, label=f"batch {b} ({count} drones)")
+
+    if polys:
+        ends = np.array([w[0] for _, w in polys] + [w[-1] for _, w in polys])
+        ax.scatter(ends[:, 0], ends[:, 1], ends[:, 2], color="k", s=8, depthshade=False)
+        pts = np.vstack([w for _, w in polys])
+        pad = (pts.max(axis=0) - pts.min(axis=0)) * 0.1 + 1.0
+        ax.set_xlim(pts[:,0].min() - pad[0], pts[:,0].max() + pad[0])
+        ax.set_ylim(pts[:,1].min() - pad[1], pts[:,1].max() + pad[1])
+        ax.set_zlim(pts[:,2].min() - pad[2], pts[:,2].max() + pad[2])
+
+    ax.set_xlabel("X (m)")
+    ax.set_ylabel("Y (m)")
+    ax.set_zlabel("Z (m)")
+    t = title if title else scen.get("scenario_id", "scenario")
+    n_pts = sum(len(w) for _, w in polys)
+    ax.set_title(f"{t} — LOD view ({len(polys)} drones, {n_pts} pts, {lod_label})")
+    ax.legend(loc='upper left', bbox_to_anchor=(1.05, 1.0))
+    plt.tight_layout()
+    plt.show()
+
+
 def plot_matplotlib(scen, title=None, show_legend=True, waypoint_markersize=30):
     drones = scen["drones"]
     fig = plt.figure(figsize=(10, 7))
@@ -114,15 +239,71 @@ def export_plotly_html(scen, out_html):
     print("Wrote HTML interactive view to:", out_html)
 
 
+def export_plotly_html_lod(scen, out_html, tolerance=0.5, max_points=20000, n_batches=10,
+                           embed_plotlyjs=False):
+    if not _HAS_PLOTLY:
+        raise RuntimeError("plotly is not installed. Install with `pip install plotly` to use HTML export.")
+    polys, lod_label = lod_polylines(scen, tolerance, max_points)
+    fig = go.Figure()
+    colors = ["blue","orange","green","red","purple","brown","pink","gray","olive","cyan"]
+    for b, (count, pts) in enumerate(batch_polylines(polys, n_batches)):
+        fig.add_trace(go.Scatter3d(x=pts[:,0], y=pts[:,1], z=pts[:,2],
+                                   mode='lines',
+                                   line=dict(width=3, color=colors[b % len(colors)]),
+                                   hoverinfo='skip',
+                                   name=f"batch {b} ({count} drones)"))
+    if polys:
+        # start/end points as a single hover-labelled marker trace instead of 2 traces per drone
+        ends = np.array([w[0] for _, w in polys] + [w[-1] for _, w in polys])
+        labels = [f"{id_}:start" for id_, _ in polys] + [f"{id_}:end" for id_, _ in polys]
+        fig.add_trace(go.Scatter3d(x=ends[:,0], y=ends[:,1], z=ends[:,2],
+                                   mode='markers', marker=dict(size=3, color='black'),
+                                   hovertext=labels, hoverinfo='text',
+                                   name="start/end"))
+    n_pts = sum(len(w) for _, w in polys)
+    fig.update_layout(scene=dict(xaxis_title='X (m)', yaxis_title='Y (m)', zaxis_title='Z (m)'),
+                      title=f"{scen.get('scenario_id','scenario')} — LOD ({len(polys)} drones, {n_pts} pts, {lod_label})",
+                      margin=dict(l=0, r=0, b=0, t=50))
+    # loading plotly.js from the CDN keeps the file to just the (simplified) data
+    fig.write_html(out_html, include_plotlyjs=True if embed_plotlyjs else "cdn")
+    print("Wrote LOD HTML interactive view to:", out_html)
+
+
+def _positive_int(value):
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {value}")
+    return n
+
+
+def _non_negative_float(value):
+    x = float(value)
+    if not x >= 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0, got {value}")
+    return x
+
+
 def main():
     p = argparse.ArgumentParser(description="Visualize scenario dataset (3D)")
     p.add_argument("scenario", help="path to scenario JSON (in data/)")
     p.add_argument("--plotly-out", help="write interactive HTML instead of opening GUI", default=None)
+    p.add_argument("--lod", action="store_true", help="simplified, batched rendering for large fleets")
+    p.add_argument("--lod-tolerance", type=_non_negative_float, default=0.5, help="LOD simplification tolerance in metres")
+    p.add_argument("--max-points", type=_positive_int, default=20000, help="LOD cap on total rendered points")
+    p.add_argument("--lod-batches", type=_positive_int, default=10, help="LOD number of merged traces")
+    p.add_argument("--embed-plotlyjs", action="store_true",
+                   help="LOD HTML: embed plotly.js for offline use instead of loading it from the CDN")
     args = p.parse_args()
 
     scen = load_scenario(args.scenario)
 
-    if args.plotly_out:
+    if args.lod:
+        lod_kwargs = dict(tolerance=args.lod_tolerance, max_points=args.max_points, n_batches=args.lod_batches)
+        if args.plotly_out:
+            export_plotly_html_lod(scen, args.plotly_out, embed_plotlyjs=args.embed_plotlyjs, **lod_kwargs)
+        else:
+            plot_matplotlib_lod(scen, title=scen.get("scenario_id", None), **lod_kwargs)
+    elif args.plotly_out:
         export_plotly_html(scen, args.plotly_out)
     else:
         plot_matplotlib(scen, title=scen.get("scenario_id", None))
@@ -1,7 +1,7 @@
 
 import numpy as np
 from lib.geofilter import seg_seg_closest_points, aabb_inflate, time_windows_overlap
-from lib.trajectory import position_at_time
+from lib.trajectory import position_at_time, build_time_index, segments_in_window
 
 import collections
 
@@ -58,10 +58,13 @@ def geometric_prefilter_grid(segsA, segsB, safety_dist, cell_size=1.0):
 
     return candidates
 
-def time_sample_confirm(segsA, segsB, iA, iB, ua, ub, safety_dist, dt=0.1):
+def time_sample_confirm(segsA, segsB, iA, iB, ua, ub, safety_dist, dt=0.1, window=None):
     sA = segsA[iA]; sB = segsB[iB]
     t0 = max(sA['t0'], sB['t0'])
     t1 = min(sA['t1'], sB['t1'])
+    if window is not None:
+        t0 = max(t0, window[0])
+        t1 = min(t1, window[1])
     if t1 < t0:
         return None
     times = np.arange(t0, t1 + 1e-9, dt)
@@ -89,3 +92,68 @@ def simple_deconflict_pipeline(segsA, segsB, safety_dist=2.0, dt=0.1):
         if conf is not None:
             conflicts.append(conf)
     return conflicts
+
+def window_deconflict_pipeline(segsA, segsB, t_from, t_to, safety_dist=2.0, dt=0.1,
+                               indexA=None, indexB=None):
+    if indexA is None:
+        indexA = build_time_index(segsA)
+    if indexB is None:
+        indexB = build_time_index(segsB)
+    loA, hiA = segments_in_window(indexA, t_from, t_to)
+    loB, hiB = segments_in_window(indexB, t_from, t_to)
+    if loA == hiA or loB == hiB:
+        return []
+
+    # only the active slices go through the spatial filter; indices are mapped back afterwards
+    subA = segsA[loA:hiA]
+    subB = segsB[loB:hiB]
+    conflicts = []
+    for (iA, iB, dmin, ua, ub) in geometric_prefilter_grid(subA, subB, safety_dist):
+        conf = time_sample_confirm(subA, subB, iA, iB, ua, ub, safety_dist, dt=dt,
+                                   window=(t_from, t_to))
+        if conf is not None:
+            conf['segA'] = loA + iA
+            conf['segB'] = loB + iB
+            conflicts.append(conf)
+    return conflicts
+
+def _cached_time_index(d, index_cache):
+    segs = d['segs']
+    if index_cache is None:
+        return build_time_index(segs)
+    # an entry is only reused for the same segment list with the same span,
+    # so a re-planned mission (new segs, shifted times) never hits a stale index
+    key = (id(segs), len(segs),
+           segs[0]['t0'] if segs else None, segs[-1]['t1'] if segs else None)
+    hit = index_cache.get(d['id'])
+    if hit is None or hit[0] != key:
+        hit = (key, build_time_index(segs))
+        index_cache[d['id']] = hit
+    return hit[1]
+
+def conflicts_in_window(drones, t_from, t_to, safety_dist=2.0, dt=0.1,
+                        primary_id=None, all_vs_all=False, index_cache=None):
+    # drones: [{'id', 'segs'}, ...]. Pass the same index_cache dict across
+    # repeated slot queries so they only pay for the segments inside the window.
+    if t_to < t_from:
+        raise ValueError(f"empty time window: t_from={t_from} > t_to={t_to}")
+    tindex = {d['id']: _cached_time_index(d, index_cache) for d in drones}
+
+    if all_vs_all:
+        pairs = [(drones[i], drones[j]) for i in range(len(drones)) for j in range(i+1, len(drones))]
+    else:
+        primary = next((d for d in drones if d['id'] == primary_id), drones[0])
+        pairs = [(primary, d) for d in drones if d['id'] != primary['id']]
+
+    all_conflicts = []
+    for A, B in pairs:
+        conflicts = window_deconflict_pipeline(A['segs'], B['segs'], t_from, t_to,
+                                               safety_dist=safety_dist, dt=dt,
+                                               indexA=tindex[A['id']], indexB=tindex[B['id']])
+        for c in conflicts:
+            c['pair'] = f"{A['id']} - {B['id']}"
+            c['other'] = B['id']
+        all_conflicts.extend(conflicts)
+
+    all_conflicts.sort(key=lambda c: c['time'])
+    return all_conflicts
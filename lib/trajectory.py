@@ -33,3 +33,18 @@ def position_at_time(segs, t):
             ratio = (t - s['t0']) / max(1e-9, (s['t1'] - s['t0']))
             return s['p0'] + s['dir'] * s['length'] * ratio
     return segs[-1]['p1'].copy()
+
+def build_time_index(segs):
+    # segments are emitted back-to-back, so t0 and t1 are both sorted
+    t0s = np.array([s['t0'] for s in segs], dtype=float)
+    t1s = np.array([s['t1'] for s in segs], dtype=float)
+    return t0s, t1s
+
+def segments_in_window(time_index, t_from, t_to):
+    # half-open index range [lo, hi) of segments active somewhere in [t_from, t_to]
+    if t_to < t_from:
+        raise ValueError(f"empty time window: t_from={t_from} > t_to={t_to}")
+    t0s, t1s = time_index
+    lo = int(np.searchsorted(t1s, t_from, side='left'))
+    hi = int(np.searchsorted(t0s, t_to, side='right'))
+    return lo, max(lo, hi)
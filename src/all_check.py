@@ -1,7 +1,8 @@
 import json, sys
+import collections
 from pathlib import Path
 from lib.trajectory import segments_from_waypoints
-from lib.collision_check import simple_deconflict_pipeline
+from lib.collision_check import simple_deconflict_pipeline, conflicts_in_window
 from lib.visualize import make_animation
 
 def load_scenario(path):
@@ -16,10 +17,17 @@ def build_segments(scen):
         drones.append({"id": d["id"], "segs": segs})
     return drones
 
-def run_all_vs_all(scen):
+def run_all_vs_all(scen, window=None, dt=0.1):
     drones = build_segments(scen)
     safety = 2.0
 
+    by_pair = None
+    if window is not None:
+        by_pair = collections.defaultdict(list)
+        for c in conflicts_in_window(drones, window[0], window[1], safety_dist=safety,
+                                     dt=dt, all_vs_all=True):
+            by_pair[c["pair"]].append(c)
+
     results = []
     N = len(drones)
 
@@ -28,9 +36,12 @@ def run_all_vs_all(scen):
             A = drones[i]
             B = drones[j]
 
-            conflicts = simple_deconflict_pipeline(
-                A["segs"], B["segs"], safety_dist=safety
-            )
+            if by_pair is None:
+                conflicts = simple_deconflict_pipeline(
+                    A["segs"], B["segs"], safety_dist=safety, dt=dt
+                )
+            else:
+                conflicts = by_pair[f"{A['id']} - {B['id']}"]
 
             results.append({
                 "pair": f"{A['id']} - {B['id']}",
@@ -73,17 +84,22 @@ def prepare_animation_inputs(drones, results):
     conflicts.sort(key=lambda x: x["time"])
     return all_trajs, conflicts
 
-def run(scenario_path):
+def run(scenario_path, window=None):
     scen = load_scenario(scenario_path)
     scenario_id = scen.get("scenario_id", Path(scenario_path).stem)
 
-    drones, results = run_all_vs_all(scen)
+    drones, results = run_all_vs_all(scen, window=window)
     pretty_print(results, scenario_id)
 
     all_trajs, conflicts = prepare_animation_inputs(drones, results)
 
     t_start = min(s["segs"][0]["t0"] for s in drones if s["segs"])
     t_end   = max(s["segs"][-1]["t1"] for s in drones if s["segs"])
+    if window is not None:
+        t_start, t_end = max(t_start, window[0]), min(t_end, window[1])
+    if t_start > t_end:
+        print("Window does not overlap any mission; skipping animation.")
+        return
 
     out_name = f"output_{scenario_id}_all.mp4"
     print("Generating animation:", out_name)
@@ -91,7 +107,14 @@ def run(scenario_path):
     print("Saved:", out_name)
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python -m src.all_check data/random_scenarios/<scenario>.json")
+    window, bad_window = None, False
+    if len(sys.argv) >= 4:
+        try:
+            window = (float(sys.argv[2]), float(sys.argv[3]))
+            bad_window = window[0] > window[1]
+        except ValueError:
+            bad_window = True
+    if len(sys.argv) < 2 or len(sys.argv) == 3 or bad_window:
+        print("Usage: python -m src.all_check data/random_scenarios/<scenario>.json [t_from t_to]  (t_from <= t_to)")
         sys.exit(0)
-    run(sys.argv[1])
+    run(sys.argv[1], window=window)
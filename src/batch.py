@@ -0,0 +1,235 @@
+import os
+os.environ.setdefault('MPLBACKEND', 'Agg')  # batch runs are headless
+
+import argparse
+import csv
+import hashlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from lib.visualize import make_animation
+from src.main import load_scenario, build_drones, compute_conflicts
+from src.all_check import build_segments, run_all_vs_all, prepare_animation_inputs
+
+
+def discover_scenarios(paths, pattern='*.json', exclude=()):
+    # resolved paths dedupe overlapping arguments; anything under `exclude`
+    # (report file, render output dir) is never treated as a scenario
+    excluded = [Path(e).resolve() for e in exclude]
+    seen = set()
+    found = []
+    for p in paths:
+        p = Path(p)
+        if p.is_dir():
+            candidates = sorted(p.rglob(pattern))
+        elif p.is_file():
+            candidates = [p]
+        else:
+            raise FileNotFoundError(f"scenario path not found: {p}")
+        for c in candidates:
+            r = c.resolve()
+            if r in seen or any(r == e or e in r.parents for e in excluded):
+                continue
+            seen.add(r)
+            found.append(str(c))
+    return found
+
+
+def _low_priority_worker():
+    if hasattr(os, 'nice'):
+        os.nice(10)
+
+
+def _drones_for_mode(scen, mode):
+    # src.main reads speed from the scenario, src.all_check uses its own fixed speed
+    return build_drones(scen) if mode == 'primary' else build_segments(scen)
+
+
+def _new_row(path, mode):
+    return {'scenario': path, 'scenario_id': Path(path).stem, 'mode': mode,
+            'n_drones': 0, 'n_conflicts': 0, 'conflicts': [], 't_range': None,
+            'load_s': 0.0, 'detect_s': 0.0, 'render_s': None, 'output': None,
+            'error': None, 'render_error': None}
+
+
+def detect_scenario(path, mode='all', dt=0.1, window=None):
+    row = _new_row(path, mode)
+    try:
+        t0 = time.perf_counter()
+        scen = load_scenario(path)
+        row['scenario_id'] = scen.get('scenario_id', row['scenario_id'])
+        row['n_drones'] = len(scen['drones'])
+        t1 = time.perf_counter()
+
+        if mode == 'primary':
+            drones = build_drones(scen)
+            safety = scen.get('safety_distance_m', 2.0)
+            conflicts = compute_conflicts(drones, safety, dt, window=window)
+        else:
+            drones, results = run_all_vs_all(scen, window=window, dt=dt)
+            conflicts = []
+            for r in results:
+                for c in r['conflicts']:
+                    c['pair'] = r['pair']
+                    conflicts.append(c)
+            conflicts.sort(key=lambda c: c['time'])
+        t2 = time.perf_counter()
+
+        row['conflicts'] = conflicts
+        row['n_conflicts'] = len(conflicts)
+        row['load_s'] = t1 - t0
+        row['detect_s'] = t2 - t1
+
+        # animation time range; None when the window misses every mission
+        spans = [(d['segs'][0]['t0'], d['segs'][-1]['t1']) for d in drones if d['segs']]
+        if spans:
+            t_start, t_end = min(a for a, _ in spans), max(b for _, b in spans)
+            if window is not None:
+                t_start, t_end = max(t_start, window[0]), min(t_end, window[1])
+            if t_start <= t_end:
+                row['t_range'] = [t_start, t_end]
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def _output_base(path, scenario_id, mode, out_dir):
+    # scenario ids are not unique across directories, so tag with a hash of the source path
+    tag = hashlib.sha1(str(Path(path).resolve()).encode()).hexdigest()[:8]
+    suffix = '_all' if mode == 'all' else ''
+    safe_id = str(scenario_id).replace('/', '_').replace('\\', '_')
+    return Path(out_dir) / f"output_{safe_id}{suffix}_{tag}"
+
+
+def render_scenario(path, mode, conflicts, t_range, out_dir, dt=0.1):
+    t0 = time.perf_counter()
+    scen = load_scenario(path)
+    drones = _drones_for_mode(scen, mode)
+    all_trajs, _ = prepare_animation_inputs(drones, [])
+    marks = [{'time': c['time'], 'position': c['position'], 'label': c['pair']} for c in conflicts]
+
+    base = _output_base(path, scen.get('scenario_id', Path(path).stem), mode, out_dir)
+    # append rather than with_suffix(): ids may contain dots
+    mp4, gif = base.parent / (base.name + '.mp4'), base.parent / (base.name + '.gif')
+    # clear leftovers so the existence check below reflects this run only
+    for stale in (mp4, gif):
+        if stale.exists():
+            stale.unlink()
+    make_animation(str(mp4), all_trajs, marks, t_range[0], t_range[1], dt=dt)
+    out_name = mp4 if mp4.exists() else gif  # make_animation falls back to GIF
+    return str(out_name), time.perf_counter() - t0
+
+
+def write_report(rows, report_base, summary):
+    report_base = Path(report_base)
+    report_base.parent.mkdir(parents=True, exist_ok=True)
+    json_path = report_base.with_suffix('.json')
+    csv_path = report_base.with_suffix('.csv')
+
+    with open(json_path, 'w') as f:
+        json.dump({'summary': summary, 'scenarios': rows}, f, indent=2)
+
+    fields = ['scenario', 'scenario_id', 'mode', 'n_drones', 'n_conflicts',
+              'load_s', 'detect_s', 'render_s', 'output', 'error', 'render_error', 'conflicts']
+    with open(csv_path, 'w', newline='') as f:
+        w = csv.DictWriter(f, fieldnames=fields)
+        w.writeheader()
+        for r in rows:
+            out = {k: r[k] for k in fields}
+            out['conflicts'] = '; '.join(f"{c['pair']}@t={c['time']:.2f} d={c['distance']:.2f}"
+                                         for c in r['conflicts'])
+            w.writerow(out)
+    return json_path, csv_path
+
+
+def run_batch(paths, mode='all', dt=0.1, window=None, workers=None, render=False,
+              render_workers=1, out_dir='batch_out', report='batch_out/report'):
+    report_files = [Path(report).with_suffix('.json'), Path(report).with_suffix('.csv')]
+    scenarios = discover_scenarios(paths, exclude=report_files + ([out_dir] if render else []))
+    print(f"Discovered {len(scenarios)} scenario(s); mode={mode}")
+    if render:
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+
+    t_begin = time.perf_counter()
+    rows = {}
+    render_jobs = {}
+    render_pool = (ProcessPoolExecutor(max_workers=render_workers, initializer=_low_priority_worker)
+                   if render else None)
+    try:
+        # workers are long-lived, so module imports are paid once per process, not per scenario
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(detect_scenario, p, mode, dt, window): p for p in scenarios}
+            for fut in as_completed(futures):
+                try:
+                    row = fut.result()
+                except Exception as e:
+                    # e.g. BrokenProcessPool when a worker is OOM-killed; keep going so the report is written
+                    row = _new_row(futures[fut], mode)
+                    row['error'] = f"{type(e).__name__}: {e}"
+                rows[row['scenario']] = row
+                status = row['error'] or ('CLEAR' if not row['n_conflicts'] else f"{row['n_conflicts']} conflict(s)")
+                print(f"[{len(rows)}/{len(scenarios)}] {row['scenario_id']}: {status}")
+                # rendering is queued as results arrive and runs in a niced pool behind detection
+                if render_pool is not None and row['error'] is None and row['t_range'] is not None:
+                    job = render_pool.submit(render_scenario, row['scenario'], mode, row['conflicts'],
+                                             row['t_range'], out_dir, dt)
+                    render_jobs[job] = row['scenario']
+        detect_wall = time.perf_counter() - t_begin
+
+        for job in as_completed(render_jobs):
+            row = rows[render_jobs[job]]
+            try:
+                row['output'], row['render_s'] = job.result()
+            except Exception as e:
+                row['render_error'] = f"{type(e).__name__}: {e}"
+    finally:
+        if render_pool is not None:
+            render_pool.shutdown()
+
+    ordered = [rows[p] for p in scenarios]
+    summary = {
+        'mode': mode,
+        'window': list(window) if window is not None else None,
+        'n_scenarios': len(ordered),
+        'n_with_conflicts': sum(1 for r in ordered if r['n_conflicts']),
+        'n_errors': sum(1 for r in ordered if r['error']),
+        'n_render_errors': sum(1 for r in ordered if r['render_error']),
+        'detect_wall_s': detect_wall,
+        'total_wall_s': time.perf_counter() - t_begin,
+    }
+    json_path, csv_path = write_report(ordered, report, summary)
+    print(f"Report: {json_path}, {csv_path}")
+    return ordered, summary
+
+
+def _positive_int(value):
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {value}")
+    return n
+
+
+def main():
+    p = argparse.ArgumentParser(description="Run deconfliction over scenario files/directories in parallel")
+    p.add_argument('paths', nargs='+', help="scenario JSON files or directories (searched recursively)")
+    p.add_argument('--mode', choices=['all', 'primary'], default='all',
+                   help="all-vs-all (src.all_check) or primary-vs-others (src.main)")
+    p.add_argument('--dt', type=float, default=0.1, help="confirmation/animation timestep (s)")
+    p.add_argument('--window', nargs=2, type=float, metavar=('T_FROM', 'T_TO'), default=None)
+    p.add_argument('--workers', type=_positive_int, default=None, help="detection processes (default: CPU count)")
+    p.add_argument('--render', action='store_true', help="also render animations at lower priority")
+    p.add_argument('--render-workers', type=_positive_int, default=1)
+    p.add_argument('--out-dir', default='batch_out', help="directory for rendered animations")
+    p.add_argument('--report', default='batch_out/report', help="report path without extension (.json/.csv)")
+    args = p.parse_args()
+
+    run_batch(args.paths, mode=args.mode, dt=args.dt,
+              window=tuple(args.window) if args.window else None,
+              workers=args.workers, render=args.render, render_workers=args.render_workers,
+              out_dir=args.out_dir, report=args.report)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 import json
 from lib.trajectory import segments_from_waypoints
-from lib.collision_check import simple_deconflict_pipeline
+from lib.collision_check import simple_deconflict_pipeline, conflicts_in_window
 from lib.visualize import make_animation
 
 
@@ -9,7 +9,11 @@ def load_scenario(path):
         return json.load(f)
 
 
-def compute_conflicts(drones, safety, dt, primary_id=None):
+def compute_conflicts(drones, safety, dt, primary_id=None, window=None):
+    if window is not None:
+        return conflicts_in_window(drones, window[0], window[1], safety_dist=safety, dt=dt,
+                                   primary_id=primary_id)
+
     if primary_id is None:
         primary = drones[0]
     else:
@@ -21,23 +25,29 @@ def compute_conflicts(drones, safety, dt, primary_id=None):
     for od in others:
         conflicts = simple_deconflict_pipeline(primary['segs'], od['segs'], safety_dist=safety, dt=dt)
         for c in conflicts:
+            c['pair'] = f"{primary['id']} - {od['id']}"
             c['other'] = od['id']
         all_conflicts.extend(conflicts)
 
+    all_conflicts.sort(key=lambda c: c['time'])
     return all_conflicts
 
 
-def run_scenario(path, dt=0.1, primary_id=None, render_video=True):
-    scen = load_scenario(path)
+def build_drones(scen):
     speed = scen.get('speed_mps', 5.0)
-    safety = scen.get('safety_distance_m', 2.0)
-
     drones = []
     for d in scen['drones']:
         segs = segments_from_waypoints(d['waypoints'], d.get('t_start', 0.0), speed)
         drones.append({'id': d['id'], 'segs': segs})
+    return drones
 
-    all_conflicts = compute_conflicts(drones, safety, dt, primary_id=primary_id)
+
+def run_scenario(path, dt=0.1, primary_id=None, render_video=True, window=None):
+    scen = load_scenario(path)
+    safety = scen.get('safety_distance_m', 2.0)
+    drones = build_drones(scen)
+
+    all_conflicts = compute_conflicts(drones, safety, dt, primary_id=primary_id, window=window)
 
     if not all_conflicts:
         print(f"RESULT ({scen.get('scenario_id', 'unknown')}): CLEAR")
@@ -53,15 +63,28 @@ def run_scenario(path, dt=0.1, primary_id=None, render_video=True):
     all_trajs = [(d['id'], d['segs'], cmap[i % len(cmap)]) for i, d in enumerate(drones)]
     t_start = min(s['t0'] for d in drones for s in d['segs'])
     t_end = max(s['t1'] for d in drones for s in d['segs'])
+    if window is not None:
+        t_start, t_end = max(t_start, window[0]), min(t_end, window[1])
+    if t_start > t_end:
+        print('Window does not overlap any mission; skipping render.')
+        return drones, all_conflicts
 
     out_name = f"output_{scen['scenario_id']}.mp4"
     print('Rendering:', out_name)
     make_animation(out_name, all_trajs, all_conflicts, t_start, t_end, dt=dt)
+    return drones, all_conflicts
 
 
 if __name__ == '__main__':
     import sys
-    if len(sys.argv) < 2:
-        print('Usage: python -m src.main data/random_scenarios/<scenario>.json')
+    window, bad_window = None, False
+    if len(sys.argv) >= 4:
+        try:
+            window = (float(sys.argv[2]), float(sys.argv[3]))
+            bad_window = window[0] > window[1]
+        except ValueError:
+            bad_window = True
+    if len(sys.argv) < 2 or len(sys.argv) == 3 or bad_window:
+        print('Usage: python -m src.main data/random_scenarios/<scenario>.json [t_from t_to]  (t_from <= t_to)')
     else:
-        run_scenario(sys.argv[1])
+        run_scenario(sys.argv[1], window=window)
@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "data" / "visualize_html"))
+from visualize_data import simplify_polyline, lod_polylines  # noqa: E402
+
+
+def _max_deviation(original, simplified):
+    # distance from every original point to the nearest segment of the simplified polyline
+    worst = 0.0
+    for p in original:
+        best = np.inf
+        for a, b in zip(simplified[:-1], simplified[1:]):
+            ab = b - a
+            L2 = float(np.dot(ab, ab))
+            u = 0.0 if L2 == 0 else float(np.clip(np.dot(p - a, ab) / L2, 0.0, 1.0))
+            best = min(best, float(np.linalg.norm(p - (a + u * ab))))
+        worst = max(worst, best)
+    return worst
+
+
+def _fleet(n_drones, n_waypoints, scale=100.0, seed=0):
+    rng = np.random.default_rng(seed)
+    return {"drones": [{"id": f"d{i}", "waypoints": (rng.random((n_waypoints, 3)) * scale).tolist()}
+                       for i in range(n_drones)]}
+
+
+def _rendered_points(polys):
+    # path points plus one start and one end marker per drone
+    return sum(len(w) for _, w in polys) + 2 * len(polys)
+
+
+def test_simplify_keeps_endpoints_and_drops_collinear():
+    pts = np.array([[0, 0, 0], [1, 0, 0], [2, 0, 0], [3, 0, 0]], dtype=float)
+    out = simplify_polyline(pts, 0.01)
+    assert np.array_equal(out, pts[[0, -1]])
+
+
+@pytest.mark.parametrize("tol", [0.5, 2.0, 10.0])
+def test_simplify_respects_tolerance(tol):
+    rng = np.random.default_rng(1)
+    pts = np.cumsum(rng.normal(size=(200, 3)), axis=0)
+    out = simplify_polyline(pts, tol)
+    assert np.array_equal(out[0], pts[0]) and np.array_equal(out[-1], pts[-1])
+    assert _max_deviation(pts, out) <= tol + 1e-9
+
+
+@pytest.mark.parametrize("n_drones,n_waypoints,max_points", [
+    (5, 5, 6),
+    (7, 5, 10),
+    (3000, 5, 1000),
+    (100, 50, 400),
+    (3, 5, 3),
+])
+def test_lod_respects_point_cap(n_drones, n_waypoints, max_points):
+    polys, _ = lod_polylines(_fleet(n_drones, n_waypoints), tolerance=0.0, max_points=max_points)
+    assert _rendered_points(polys) <= max_points
+
+
+def test_lod_stride_fallback_respects_cap():
+    # coordinates so large that tolerance doubling alone cannot reach the budget
+    polys, label = lod_polylines(_fleet(100, 50, scale=1e7), tolerance=0.0, max_points=400)
+    assert _rendered_points(polys) <= 400
+    assert "stride" in label
+
+
+def test_lod_reported_tolerance_bounds_original_paths():
+    scen = _fleet(20, 100)
+    polys, label = lod_polylines(scen, tolerance=0.5, max_points=1000)
+    tol = float(label.split("tol=")[1].split(" m")[0])
+    for (_, simplified), d in zip(polys, scen["drones"]):
+        original = np.array(d["waypoints"], dtype=float)
+        assert _max_deviation(original, simplified) <= tol + 1e-9